@@ -4,19 +4,235 @@ import winreg
 import subprocess
 import shutil
 import json
+import locale
+import hashlib
+import functools
+import itertools
+import tempfile
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinter.scrolledtext import ScrolledText
 import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Use orjson for the configuration file when available, it is much faster than json
+try:
+    import orjson
+    
+    def _dumps(obj, compact=False):
+        return orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj, compact=False):
+        return json.dumps(obj, indent=None if compact else 2).encode()
+    
+    _loads = json.loads
+
+# Once config.json grows past this many bytes, single mutations are appended
+# to config.log instead of rewriting the whole file
+_LOG_THRESHOLD = 256 * 1024
+
+# Registry shell keys for the built-in context types
+_BASE_KEYS = {
+    'directory': r'Directory\shell',
+    'file': r'*\shell',
+}
+
+def _base_key(context_type):
+    """Return the shell key under HKEY_CLASSES_ROOT for a context type."""
+    return _BASE_KEYS.get(context_type) or rf'{context_type}\shell'
+
+def _submenu_key_paths(base_key, components):
+    """
+    Get the registry path of each submenu key along a menu path.
+    
+    Every submenu keeps its children under a 'shell' subkey, so for
+    components ('A', 'B') this returns [base\\A, base\\A\\shell\\B].
+    """
+    if not components:
+        return []
+    first = f"{base_key}\\{components[0]}"
+    return list(itertools.accumulate(components[1:], lambda parent, name: f"{parent}\\shell\\{name}", initial=first))
+
+def _link_or_copy(src, dst):
+    """
+    Hard-link src to dst, falling back to a plain copy.
+    
+    Only used for files that are never modified in place (icons); scripts
+    are edited from the GUI and must not share data with the original file.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def _remove_file(path):
+    """Delete a file, ignoring it if it is already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _reg_escape(value):
+    """Escape a string for use inside a quoted .reg file value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+# Source of the launcher script installed next to the configuration
+_LAUNCHER_SRC = '''
+import sys
+import os
+import importlib.util
+import subprocess
+
+def run_script(script_path, target_path):
+    """Run a Python script with the target path as argument."""
+    # If it's a .py file, import and run it
+    if script_path.endswith('.py'):
+        # Get the directory of the script
+        script_dir = os.path.dirname(script_path)
+        
+        # Add the script directory to sys.path
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        
+        # Import the script
+        module_name = os.path.basename(script_path).replace('.py', '')
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        
+        # Set sys.argv for the script
+        original_argv = sys.argv.copy()
+        sys.argv = [script_path, target_path]
+        
+        # Execute the script
+        try:
+            spec.loader.exec_module(module)
+            # If the script has a main function, call it
+            if hasattr(module, 'main'):
+                module.main()
+        except Exception as e:
+            print(f"Error executing script: {e}")
+            input("Press Enter to continue...")
+        finally:
+            # Restore sys.argv
+            sys.argv = original_argv
+    else:
+        # For non-Python scripts, run as a subprocess
+        subprocess.run([sys.executable, script_path, target_path], check=True)
+
+if __name__ == "__main__":
+    # Check command line arguments
+    if len(sys.argv) >= 3:
+        script_path = sys.argv[1]
+        target_path = sys.argv[2]
+        
+        # Run the script
+        run_script(script_path, target_path)
+    else:
+        print("Usage: launcher.py script_path target_path")
+        input("Press Enter to continue...")
+'''
+
+# Fingerprint of _LAUNCHER_SRC, stored alongside the installed launcher
+_LAUNCHER_HASH = hashlib.blake2b(_LAUNCHER_SRC.encode(), digest_size=8).hexdigest()
 
 class ContextMenuRegistry:
     """Class for managing Windows registry entries for context menu items"""
     
-    @staticmethod
-    def add_menu_item(context_type, menu_path, command, icon=None):
+    # Pending (key_path, value_name, value) writes while a batch is open
+    _batch = None
+    _batch_depth = 0
+    
+    @classmethod
+    def begin_batch(cls):
+        """
+        Start buffering registry writes instead of applying them immediately.
+        
+        Batches may be nested; writes are only applied when the outermost
+        batch is committed.
+        """
+        if cls._batch_depth == 0:
+            cls._batch = []
+        cls._batch_depth += 1
+    
+    @classmethod
+    def commit_batch(cls):
+        """
+        Apply all buffered registry writes with a single reg.exe import.
+        
+        Returns:
+            bool: Success or failure
+        """
+        if cls._batch_depth == 0:
+            return True
+        cls._batch_depth -= 1
+        if cls._batch_depth > 0:
+            return True
+        
+        writes, cls._batch = cls._batch, None
+        if not writes:
+            return True
+        
+        # Group values by key, preserving the order keys were first written
+        keys = {}
+        for key_path, value_name, value in writes:
+            values = keys.setdefault(key_path, {})
+            if value_name is not None:
+                values[value_name] = value
+        
+        lines = ["Windows Registry Editor Version 5.00", ""]
+        for key_path, values in keys.items():
+            lines.append(f"[HKEY_CLASSES_ROOT\\{key_path}]")
+            for value_name, value in values.items():
+                name = f'"{_reg_escape(value_name)}"' if value_name else "@"
+                lines.append(f'{name}="{_reg_escape(value)}"')
+            lines.append("")
+        
+        fd, reg_path = tempfile.mkstemp(suffix=".reg")
+        try:
+            # reg.exe expects UTF-16 for version 5.00 files
+            with os.fdopen(fd, 'w', encoding='utf-16') as f:
+                f.write("\n".join(lines))
+            # The GUI runs under pythonw, so keep reg.exe from flashing a console window
+            subprocess.run(["reg", "import", reg_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
+            return True
+        except Exception as e:
+            print(f"Error importing registry batch: {e}")
+            return False
+        finally:
+            os.remove(reg_path)
+    
+    @classmethod
+    def _write_key(cls, key_path, values):
+        """Create a key under HKEY_CLASSES_ROOT and set its string values, or buffer them in a batch."""
+        if cls._batch is not None:
+            if not values:
+                cls._batch.append((key_path, None, None))
+            for value_name, value in values.items():
+                cls._batch.append((key_path, value_name, value))
+            return
+        
+        if values.keys() == {""}:
+            # Create the key and set its default value in a single call
+            winreg.SetValue(winreg.HKEY_CLASSES_ROOT, key_path, winreg.REG_SZ, values[""])
+            return
+        
+        with winreg.CreateKeyEx(winreg.HKEY_CLASSES_ROOT, key_path, 0, winreg.KEY_WRITE) as key:
+            for value_name, value in values.items():
+                winreg.SetValueEx(key, value_name, 0, winreg.REG_SZ, value)
+    
+    @classmethod
+    def add_menu_item(cls, context_type, menu_path, command, icon=None):
         """
         Add a menu item to the Windows context menu
         
+        Inside a begin_batch()/commit_batch() pair the writes are buffered
+        and applied together when the batch is committed.
+        
         Args:
             context_type (str): Type of context ('directory', 'file', '*', etc.)
             menu_path (str): Path in context menu (e.g., 'ScriptTools\\PDF Tools')
@@ -26,61 +242,106 @@ class ContextMenuRegistry:
         Returns:
             bool: Success or failure
         """
+        # The last component is the command name, the rest are submenus
+        submenu_path, _, name = menu_path.rpartition('\\')
+        shell_key_path = cls.ensure_submenu_path(context_type, submenu_path)
+        if shell_key_path is None:
+            return False
+        return cls.add_command(shell_key_path, name, command, icon)
+    
+    @classmethod
+    def ensure_submenu_path(cls, context_type, submenu_path):
+        """
+        Create the chain of submenu keys for a menu path.
+        
+        Scripts sharing a category can call this once and then add each
+        command with add_command().
+        
+        Args:
+            context_type (str): Type of context ('directory', 'file', '*', etc.)
+            submenu_path (str): Submenu path without the command name (e.g., 'ScriptTools\\PDF Tools')
+            
+        Returns:
+            str: Registry path of the shell key that holds the commands, or None on failure
+        """
         try:
             # Determine the registry key based on context type
-            if context_type == 'directory':
-                base_key = r'Directory\shell'
-            elif context_type == 'file':
-                base_key = r'*\shell'
+            base_key = _base_key(context_type)
+            if not submenu_path:
+                return base_key
+            
+            components = tuple(submenu_path.split('\\'))
+            submenu_paths = _submenu_key_paths(base_key, components)
+            
+            if cls._batch is None:
+                cls._create_submenu_chain(base_key, components)
             else:
-                base_key = rf'{context_type}\shell'
-                
-            # Create registry keys for path components
-            key_path = base_key
-            path_components = menu_path.split('\\')
+                for i, (component, submenu_key_path) in enumerate(zip(components, submenu_paths)):
+                    # Create a key for this submenu and set MUIVerb for its display name
+                    cls._write_key(submenu_key_path, {"MUIVerb": component, "subcommands": ""})
+                    
+                    # If this is the first component, set the shell key
+                    if i == 0:
+                        cls._write_key(f"{submenu_key_path}\\shell", {})
             
-            # Process all components except the last (which is the command name)
-            for i, component in enumerate(path_components[:-1]):
-                # Create a key for this submenu and set MUIVerb for its display name
-                submenu_key_path = f"{key_path}\\{component}"
-                submenu_key = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, submenu_key_path)
-                winreg.SetValueEx(submenu_key, "MUIVerb", 0, winreg.REG_SZ, component)
-                winreg.SetValueEx(submenu_key, "subcommands", 0, winreg.REG_SZ, "")
-                
-                # If this is the first component, set the shell key
-                if i == 0:
-                    shell_key_path = f"{submenu_key_path}\\shell"
-                    shell_key = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, shell_key_path)
-                    winreg.CloseKey(shell_key)
-                
-                winreg.CloseKey(submenu_key)
-                
-                # Update key_path to include this component and its shell subkey
-                key_path = f"{submenu_key_path}\\shell"
+            return f"{submenu_paths[-1]}\\shell"
+        except Exception as e:
+            print(f"Error adding submenu: {e}")
+            return None
+    
+    @staticmethod
+    def _create_submenu_chain(base_key, components):
+        """
+        Create submenu keys directly in the registry.
+        
+        Each key is created relative to the handle of its parent's shell key,
+        so the registry walks one level per component instead of the full path.
+        """
+        parent = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, base_key)
+        try:
+            for component in components:
+                with winreg.CreateKey(parent, component) as submenu:
+                    winreg.SetValueEx(submenu, "MUIVerb", 0, winreg.REG_SZ, component)
+                    winreg.SetValueEx(submenu, "subcommands", 0, winreg.REG_SZ, "")
+                    shell = winreg.CreateKey(submenu, "shell")
+                winreg.CloseKey(parent)
+                parent = shell
+        finally:
+            winreg.CloseKey(parent)
+    
+    @classmethod
+    def add_command(cls, shell_key_path, name, command, icon=None):
+        """
+        Add a command under a shell key created by ensure_submenu_path().
+        
+        Args:
+            shell_key_path (str): Registry path of the parent shell key
+            name (str): Display name of the command
+            command (str): Command to execute
+            icon (str, optional): Path to icon file
             
-            # Create the final command key with the last path component
-            command_key_path = f"{key_path}\\{path_components[-1]}"
-            command_key = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, command_key_path)
-            winreg.SetValueEx(command_key, "", 0, winreg.REG_SZ, path_components[-1])
+        Returns:
+            bool: Success or failure
+        """
+        try:
+            command_key_path = f"{shell_key_path}\\{name}"
+            command_values = {"": name}
             
             # Set icon if provided
             if icon:
-                winreg.SetValueEx(command_key, "Icon", 0, winreg.REG_SZ, icon)
+                command_values["Icon"] = icon
+            cls._write_key(command_key_path, command_values)
             
             # Create command subkey
-            cmd_subkey = winreg.CreateKey(command_key, "command")
-            winreg.SetValueEx(cmd_subkey, "", 0, winreg.REG_SZ, command)
-            
-            winreg.CloseKey(cmd_subkey)
-            winreg.CloseKey(command_key)
+            cls._write_key(f"{command_key_path}\\command", {"": command})
             
             return True
         except Exception as e:
             print(f"Error adding menu item: {e}")
             return False
     
-    @staticmethod
-    def remove_menu_item(context_type, menu_path):
+    @classmethod
+    def remove_menu_item(cls, context_type, menu_path):
         """
         Remove a menu item from the Windows context menu
         
@@ -91,24 +352,32 @@ class ContextMenuRegistry:
         Returns:
             bool: Success or failure
         """
-        try:
-            # Determine the registry key based on context type
-            if context_type == 'directory':
-                base_key = r'Directory\shell'
-            elif context_type == 'file':
-                base_key = r'*\shell'
-            else:
-                base_key = rf'{context_type}\shell'
-            
-            # Split the menu path into components
-            path_components = menu_path.split('\\')
+        submenu_paths = cls.queue_removal(context_type, menu_path)
+        if submenu_paths is None:
+            return False
+        cls.prune_empty_parents(submenu_paths)
+        return True
+    
+    @staticmethod
+    def queue_removal(context_type, menu_path):
+        """
+        Delete only the command key of a menu item, leaving its submenus.
+        
+        Call prune_empty_parents() with the returned paths once all items
+        of a bulk removal are deleted.
+        
+        Args:
+            context_type (str): Type of context ('directory', 'file', '*', etc.)
+            menu_path (str): Path in context menu (e.g., 'ScriptTools\\PDF Tools')
             
-            # Build the full path to the command key
-            key_path = base_key
-            for i, component in enumerate(path_components[:-1]):
-                key_path = f"{key_path}\\{component}"
-                if i == 0:
-                    key_path = f"{key_path}\\shell"
+        Returns:
+            list: Registry paths of the item's submenu keys, or None on failure
+        """
+        try:
+            # The last component is the command name, the rest are submenus
+            path_components = tuple(menu_path.split('\\'))
+            submenu_paths = _submenu_key_paths(_base_key(context_type), path_components[:-1])
+            key_path = f"{submenu_paths[-1]}\\shell" if submenu_paths else _base_key(context_type)
             
             # Delete the command key
             command_key_path = f"{key_path}\\{path_components[-1]}"
@@ -125,38 +394,29 @@ class ContextMenuRegistry:
             except Exception:
                 pass
             
-            # Cleanup: if this was the last item in a category, remove the category too
+            return submenu_paths
+        except Exception as e:
+            print(f"Error removing menu item: {e}")
+            return None
+    
+    @staticmethod
+    def prune_empty_parents(submenu_paths):
+        """
+        Remove submenus left empty after deleting menu items.
+        
+        Each distinct submenu is tried once, deepest first. DeleteKey refuses
+        keys that still have subkeys, so submenus with remaining items (and
+        therefore their ancestors) are kept.
+        
+        Args:
+            submenu_paths (iterable): Registry paths of submenu keys
+        """
+        for submenu_key_path in sorted(set(submenu_paths), key=lambda path: path.count('\\'), reverse=True):
             try:
-                # Check if the shell key is empty
-                shell_key = winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, key_path)
-                try:
-                    winreg.EnumKey(shell_key, 0)
-                    has_subkeys = True
-                except Exception:
-                    has_subkeys = False
-                winreg.CloseKey(shell_key)
-                
-                if not has_subkeys:
-                    # Remove empty parent keys (working backwards from bottom to top)
-                    for i in range(len(path_components) - 1, 0, -1):
-                        parent_path = base_key
-                        for j in range(i):
-                            parent_path = f"{parent_path}\\{path_components[j]}"
-                            if j == 0:
-                                parent_path = f"{parent_path}\\shell"
-                        
-                        try:
-                            winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, parent_path)
-                        except Exception:
-                            # If we can't delete it (not empty), stop going up
-                            break
+                winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, f"{submenu_key_path}\\shell")
+                winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, submenu_key_path)
             except Exception:
                 pass
-            
-            return True
-        except Exception as e:
-            print(f"Error removing menu item: {e}")
-            return False
 
 class ScriptManager:
     """Class for managing script files and configuration"""
@@ -166,37 +426,237 @@ class ScriptManager:
         self.app_dir = os.path.join(os.environ['APPDATA'], 'AdvancedScriptLauncher')
         self.scripts_dir = os.path.join(self.app_dir, 'scripts')
         self.config_path = os.path.join(self.app_dir, 'config.json')
+        self.log_path = os.path.join(self.app_dir, 'config.log')
         self.launcher_path = os.path.join(self.app_dir, 'launcher.py')
+        self.launcher_hash_path = self.launcher_path + '.sha'
         
         # Create necessary directories if they don't exist
         os.makedirs(self.scripts_dir, exist_ok=True)
         
-        # Create launcher script if it doesn't exist
-        if not os.path.exists(self.launcher_path):
+        # Create launcher script if it is missing or out of date
+        if not self._launcher_is_current():
             self._create_launcher_script()
         
+        # Pending configuration changes and nesting level of batch()
+        self._dirty = False
+        self._batch_depth = 0
+        
+        # Incremented on every configuration change, for callers caching derived data
+        self.version = 0
+        
         # Load configuration
+        self._snapshot_size = 0
+        # Generation of config.json; change log records carry the generation
+        # they were appended to, so records already folded into a newer
+        # snapshot are never replayed
+        self._generation = 0
+        self._log_stale = False
         self.config = self.load_config()
+        self._rebuild_indexes()
+        
+        # Fold the change log back into config.json once it outgrows it, or
+        # right away if it holds a torn entry that later appends would
+        # otherwise be glued onto, or records from an older snapshot
+        try:
+            if self._log_stale or os.path.getsize(self.log_path) > self._snapshot_size:
+                self.compact()
+        except FileNotFoundError:
+            pass
+    
+    def _rebuild_indexes(self):
+        """Rebuild the id lookup tables for categories and scripts."""
+        self._cats_by_id = {c['id']: c for c in self.config['categories']}
+        self._scripts_by_id = {s['id']: s for s in self.config['scripts']}
+        self._path_cache = {}
     
     def load_config(self):
         """Load the configuration file or create a new one if it doesn't exist."""
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            with open(self.config_path, 'rb') as f:
+                data = f.read()
+            self._snapshot_size = len(data)
+            config = _loads(data)
+            self._generation = config.pop('_generation', 0)
+            self._replay_log(config)
+            return config
         else:
             default_config = {
                 'categories': [],
                 'scripts': [],
                 'python_path': sys.executable
             }
-            with open(self.config_path, 'w') as f:
-                json.dump(default_config, f, indent=4)
+            data = _dumps(default_config)
+            with open(self.config_path, 'wb') as f:
+                f.write(data)
+            self._snapshot_size = len(data)
             return default_config
     
+    def _replay_log(self, config):
+        """Apply the mutations recorded in the change log to a loaded config."""
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return
+        
+        with f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    # Partially written entry from an interrupted save; entries
+                    # appended after it start on their own line, so keep going
+                    self._log_stale = True
+                    continue
+                
+                # Left over from before the snapshot was last rewritten, if
+                # the log couldn't be removed afterwards
+                if entry.get('gen', 0) != self._generation:
+                    self._log_stale = True
+                    continue
+                self._apply_op(config, entry['op'], entry['data'])
+    
+    @staticmethod
+    def _apply_op(config, op, data):
+        """
+        Apply one change log entry to a config.
+        
+        Entries must be applied in order, and only on top of the snapshot
+        generation they were logged against; replaying them on a newer
+        snapshot could resurrect or drop items.
+        """
+        if op in ('put_category', 'put_script'):
+            items = config['categories' if op == 'put_category' else 'scripts']
+            for index, item in enumerate(items):
+                if item['id'] == data['id']:
+                    items[index] = data
+                    break
+            else:
+                items.append(data)
+        elif op == 'remove_script':
+            config['scripts'] = [s for s in config['scripts'] if s['id'] != data['id']]
+        elif op == 'remove_categories':
+            ids = set(data['ids'])
+            config['scripts'] = [s for s in config['scripts'] if s['category'] not in ids]
+            config['categories'] = [c for c in config['categories'] if c['id'] not in ids]
+    
+    def _record(self, op, data):
+        """
+        Persist a single mutation.
+        
+        Small configurations are simply saved; large ones append the change
+        to config.log so the cost doesn't grow with the size of the config.
+        
+        Args:
+            op (str): Operation name understood by _apply_op()
+            data (dict): Operation payload
+        """
+        if self._snapshot_size < _LOG_THRESHOLD or self._dirty:
+            self.save_config()
+            return
+        self.version += 1
+        entry = _dumps({'gen': self._generation, 'op': op, 'data': data}, compact=True) + b"\n"
+        with open(self.log_path, 'a+b') as f:
+            # Start on a new line if the last entry was cut off mid-write
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    entry = b"\n" + entry
+            f.write(entry)
+    
+    def compact(self):
+        """Write the full configuration to config.json and clear the change log."""
+        self._dirty = True
+        self.flush_config()
+    
     def save_config(self):
-        """Save the current configuration to file."""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        """
+        Mark the configuration as changed.
+        
+        The file is written immediately unless a batch() is open, in which
+        case it is written once when the outermost batch ends.
+        """
+        self._dirty = True
+        self.version += 1
+        if not self._batch_depth:
+            self.flush_config()
+    
+    def flush_config(self):
+        """
+        Write the configuration to file if it has unsaved changes.
+        
+        The file is written to a temporary path and then moved over the old
+        one, so a crash mid-write never leaves a truncated config behind.
+        """
+        if not self._dirty:
+            return
+        generation = self._generation + 1
+        data = _dumps({**self.config, '_generation': generation})
+        tmp_path = self.config_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.config_path)
+        self._generation = generation
+        self._snapshot_size = len(data)
+        self._dirty = False
+        
+        # The snapshot now includes everything in the change log. Should the
+        # log survive a crash here, its records carry the old generation and
+        # are skipped on the next load.
+        _remove_file(self.log_path)
+    
+    @contextmanager
+    def batch(self):
+        """Group several mutations so the configuration is written only once."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush_config()
+    
+    @property
+    def categories_by_id(self):
+        """dict: Live mapping of category ID to category."""
+        return self._cats_by_id
+    
+    @property
+    def scripts_by_id(self):
+        """dict: Live mapping of script ID to script."""
+        return self._scripts_by_id
+    
+    def replace_config(self, config):
+        """
+        Replace the whole configuration (e.g. on import).
+        
+        Args:
+            config (dict): New configuration
+        """
+        self.config = config
+        self._rebuild_indexes()
+        self.save_config()
+    
+    def _replace_registry_entries(self, config):
+        """
+        Replace the configuration together with its registry entries.
+        
+        The entries of the current scripts are removed in one pass, then the
+        entries of the new scripts are written in a single registry import.
+        
+        Args:
+            config (dict): New configuration
+            
+        Returns:
+            bool: True if all registry entries were written
+        """
+        with self.batch():
+            self._remove_registry_entries_bulk(self.config['scripts'])
+            self.replace_config(config)
+            return self._create_registry_entries_bulk(self.config['scripts'])
     
     def add_category(self, name, parent=None):
         """
@@ -216,7 +676,8 @@ class ScriptManager:
             'parent': parent
         }
         self.config['categories'].append(category)
-        self.save_config()
+        self._cats_by_id[category_id] = category
+        self._record('put_category', category)
         return category_id
     
     def remove_category(self, category_id):
@@ -229,19 +690,58 @@ class ScriptManager:
         Returns:
             bool: Success or failure
         """
-        # Find all scripts in this category and remove them
-        scripts_to_remove = [s for s in self.config['scripts'] if s['category'] == category_id]
+        # Collect the category and all its descendants
+        children_by_parent = defaultdict(list)
+        for category in self.config['categories']:
+            children_by_parent[category['parent']].append(category['id'])
+        
+        to_delete = set()
+        stack = [category_id]
+        while stack:
+            current = stack.pop()
+            if current in to_delete:
+                continue
+            to_delete.add(current)
+            stack.extend(children_by_parent[current])
+        
+        # Remove the scripts of every collected category
+        scripts_to_remove = [s for s in self.config['scripts'] if s['category'] in to_delete]
+        self._remove_registry_entries_bulk(scripts_to_remove)
         for script in scripts_to_remove:
-            self.remove_script(script['id'])
+            self._delete_script_files(script)
+            del self._scripts_by_id[script['id']]
+        
+        # Drop the scripts and categories from the configuration in one pass each
+        self.config['scripts'] = [s for s in self.config['scripts'] if s['category'] not in to_delete]
+        self.config['categories'] = [c for c in self.config['categories'] if c['id'] not in to_delete]
+        for removed_id in to_delete:
+            self._cats_by_id.pop(removed_id, None)
+            self._path_cache.pop(removed_id, None)
+        self._record('remove_categories', {'ids': list(to_delete)})
+        return True
+    
+    def update_category(self, category_id, name, parent):
+        """
+        Rename or move a category.
+        
+        Args:
+            category_id (str): Category ID
+            name (str): New category name
+            parent (str): New parent category ID
+            
+        Returns:
+            bool: Success or failure
+        """
+        category = self._cats_by_id.get(category_id)
+        if not category:
+            return False
         
-        # Remove subcategories recursively
-        subcategories = [c for c in self.config['categories'] if c['parent'] == category_id]
-        for subcat in subcategories:
-            self.remove_category(subcat['id'])
+        category['name'] = name
+        category['parent'] = parent
         
-        # Remove the category itself
-        self.config['categories'] = [c for c in self.config['categories'] if c['id'] != category_id]
-        self.save_config()
+        # Paths of this category and its descendants are now stale
+        self._path_cache.clear()
+        self._record('put_category', category)
         return True
     
     def get_category_path(self, category_id):
@@ -254,20 +754,23 @@ class ScriptManager:
         Returns:
             str: Full category path (e.g., 'ScriptTools\\PDF Tools')
         """
-        if not category_id:
-            return "ScriptTools"
-        
-        # Find this category
-        category = next((c for c in self.config['categories'] if c['id'] == category_id), None)
-        if not category:
-            return "ScriptTools"
+        path = self._path_cache.get(category_id)
+        if path is not None:
+            return path
+        
+        # Walk up the parent chain, collecting names from leaf to root
+        parts = []
+        current = category_id
+        while current:
+            category = self._cats_by_id.get(current)
+            if not category:
+                break
+            parts.append(category['name'])
+            current = category['parent']
         
-        # If has parent, get parent path recursively
-        if category['parent']:
-            parent_path = self.get_category_path(category['parent'])
-            return f"{parent_path}\\{category['name']}"
-        else:
-            return f"ScriptTools\\{category['name']}"
+        path = "\\".join(["ScriptTools"] + parts[::-1])
+        self._path_cache[category_id] = path
+        return path
     
     def add_script(self, script_path, name, category_id, contexts, icon_path=None):
         """
@@ -290,7 +793,7 @@ class ScriptManager:
         file_ext = os.path.splitext(script_path)[1]
         dest_filename = f"{script_id}{file_ext}"
         dest_path = os.path.join(self.scripts_dir, dest_filename)
-        shutil.copy2(script_path, dest_path)
+        shutil.copyfile(script_path, dest_path)
         
         # Copy icon if provided
         icon_dest = None
@@ -298,7 +801,7 @@ class ScriptManager:
             icon_ext = os.path.splitext(icon_path)[1]
             icon_filename = f"{script_id}_icon{icon_ext}"
             icon_dest = os.path.join(self.scripts_dir, icon_filename)
-            shutil.copy2(icon_path, icon_dest)
+            _link_or_copy(icon_path, icon_dest)
         
         # Add to configuration
         script_info = {
@@ -310,7 +813,8 @@ class ScriptManager:
             'icon': icon_filename if icon_path else None
         }
         self.config['scripts'].append(script_info)
-        self.save_config()
+        self._scripts_by_id[script_id] = script_info
+        self._record('put_script', script_info)
         
         # Create registry entries
         self._create_registry_entries(script_info)
@@ -332,7 +836,7 @@ class ScriptManager:
             bool: Success or failure
         """
         # Find the script
-        script = next((s for s in self.config['scripts'] if s['id'] == script_id), None)
+        script = self._scripts_by_id.get(script_id)
         if not script:
             return False
         
@@ -347,23 +851,20 @@ class ScriptManager:
         if contexts:
             script['contexts'] = contexts
         
-        # Update icon if provided
-        if icon_path:
+        # Update icon if provided (and not just the script's current icon)
+        old_icon_path = os.path.join(self.scripts_dir, script['icon']) if script['icon'] else None
+        if icon_path and not (old_icon_path and os.path.normcase(os.path.abspath(icon_path)) == os.path.normcase(old_icon_path)):
             # Remove old icon if exists
-            if script['icon']:
-                old_icon_path = os.path.join(self.scripts_dir, script['icon'])
-                if os.path.exists(old_icon_path):
-                    os.remove(old_icon_path)
+            if old_icon_path:
+                _remove_file(old_icon_path)
             
             # Copy new icon
-            icon_ext = os.path.splitext(icon_path)[1]
-            icon_filename = f"{script_id}_icon{icon_ext}"
-            icon_dest = os.path.join(self.scripts_dir, icon_filename)
-            shutil.copy2(icon_path, icon_dest)
+            icon_filename = f"{script_id}_icon{os.path.splitext(icon_path)[1]}"
+            _link_or_copy(icon_path, os.path.join(self.scripts_dir, icon_filename))
             script['icon'] = icon_filename
         
         # Save configuration
-        self.save_config()
+        self._record('put_script', script)
         
         # Create new registry entries
         self._create_registry_entries(script)
@@ -381,118 +882,157 @@ class ScriptManager:
             bool: Success or failure
         """
         # Find the script
-        script = next((s for s in self.config['scripts'] if s['id'] == script_id), None)
+        script = self._scripts_by_id.get(script_id)
         if not script:
             return False
         
-        # Remove registry entries
+        # Remove registry entries and files
         self._remove_registry_entries(script)
-        
-        # Remove script file
-        script_path = os.path.join(self.scripts_dir, script['filename'])
-        if os.path.exists(script_path):
-            os.remove(script_path)
-        
-        # Remove icon if exists
-        if script['icon']:
-            icon_path = os.path.join(self.scripts_dir, script['icon'])
-            if os.path.exists(icon_path):
-                os.remove(icon_path)
+        self._delete_script_files(script)
         
         # Remove from configuration
         self.config['scripts'] = [s for s in self.config['scripts'] if s['id'] != script_id]
-        self.save_config()
+        del self._scripts_by_id[script_id]
+        self._record('remove_script', {'id': script_id})
         
         return True
     
-    def _create_registry_entries(self, script):
-        """Create the registry entries for a script."""
-        # Get the script path
-        script_path = os.path.join(self.scripts_dir, script['filename'])
-        
-        # Get category path
-        category_path = self.get_category_path(script['category'])
-        menu_path = f"{category_path}\\{script['name']}"
+    def _delete_script_files(self, script):
+        """Remove the script file and icon of a script."""
+        # Remove script file
+        _remove_file(os.path.join(self.scripts_dir, script['filename']))
         
-        # Get icon path
-        icon_path = None
+        # Remove icon if exists
         if script['icon']:
-            icon_path = os.path.join(self.scripts_dir, script['icon'])
+            _remove_file(os.path.join(self.scripts_dir, script['icon']))
+    
+    def _create_registry_entries(self, script):
+        """Create the registry entries for a script, writing them directly."""
+        return self._create_registry_entries_bulk([script], batch=False)
+    
+    def _create_registry_entries_bulk(self, scripts, batch=True):
+        """
+        Create the registry entries for several scripts.
         
-        # Create command string
-        launcher_cmd = f'"{self.config["python_path"]}" "{self.launcher_path}" "{script_path}" "%1"'
+        Scripts are grouped by context and category so every submenu chain
+        is written once, followed by the commands of the scripts in it.
         
-        # Add registry entries for each context
-        for context in script['contexts']:
-            ContextMenuRegistry.add_menu_item(context, menu_path, launcher_cmd, icon_path)
+        Args:
+            scripts (list): Scripts to create entries for
+            batch (bool): Apply the writes with a single registry import
+                instead of writing each key directly. A single script is
+                always written directly, which is cheaper than starting
+                reg.exe for a handful of keys.
+                
+        Returns:
+            bool: True if all entries were written
+        """
+        batch = batch and len(scripts) > 1
+        
+        groups = defaultdict(list)
+        for script in scripts:
+            category_path = self.get_category_path(script['category'])
+            for context in script['contexts']:
+                groups[(context, category_path)].append(script)
+        
+        # Add registry entries for all groups, in a single registry import
+        # when batching
+        ok = True
+        if batch:
+            ContextMenuRegistry.begin_batch()
+        try:
+            for (context, category_path), group in groups.items():
+                shell_key_path = ContextMenuRegistry.ensure_submenu_path(context, category_path)
+                if shell_key_path is None:
+                    ok = False
+                    continue
+                
+                for script in group:
+                    # Get the script path
+                    script_path = os.path.join(self.scripts_dir, script['filename'])
+                    
+                    # Get icon path
+                    icon_path = None
+                    if script['icon']:
+                        icon_path = os.path.join(self.scripts_dir, script['icon'])
+                    
+                    # Create command string
+                    launcher_cmd = f'"{self.config["python_path"]}" "{self.launcher_path}" "{script_path}" "%1"'
+                    
+                    if not ContextMenuRegistry.add_command(shell_key_path, script['name'], launcher_cmd, icon_path):
+                        ok = False
+        finally:
+            if batch and not ContextMenuRegistry.commit_batch():
+                ok = False
+        return ok
+    
+    def _batch_registry_update(self, scripts):
+        """Recreate the registry entries of several scripts in one pass."""
+        self._remove_registry_entries_bulk(scripts)
+        return self._create_registry_entries_bulk(scripts)
     
     def _remove_registry_entries(self, script):
         """Remove the registry entries for a script."""
-        # Get category path
-        category_path = self.get_category_path(script['category'])
-        menu_path = f"{category_path}\\{script['name']}"
+        self._remove_registry_entries_bulk([script])
+    
+    def _remove_registry_entries_bulk(self, scripts):
+        """
+        Remove the registry entries for several scripts.
+        
+        Command keys are deleted first and empty submenus are pruned once
+        at the end, instead of after every single item.
+        """
+        touched = set()
+        for script in scripts:
+            # Get category path
+            category_path = self.get_category_path(script['category'])
+            menu_path = f"{category_path}\\{script['name']}"
+            
+            # Remove registry entries for each context
+            for context in script['contexts']:
+                submenu_paths = ContextMenuRegistry.queue_removal(context, menu_path)
+                if submenu_paths:
+                    touched.update(submenu_paths)
         
-        # Remove registry entries for each context
-        for context in script['contexts']:
-            ContextMenuRegistry.remove_menu_item(context, menu_path)
+        ContextMenuRegistry.prune_empty_parents(touched)
     
     def _create_launcher_script(self):
         """Create the launcher script that will execute the selected Python script."""
         with open(self.launcher_path, 'w') as f:
-            f.write('''
-import sys
-import os
-import importlib.util
-import subprocess
-
-def run_script(script_path, target_path):
-    """Run a Python script with the target path as argument."""
-    # If it's a .py file, import and run it
-    if script_path.endswith('.py'):
-        # Get the directory of the script
-        script_dir = os.path.dirname(script_path)
-        
-        # Add the script directory to sys.path
-        if script_dir not in sys.path:
-            sys.path.insert(0, script_dir)
-        
-        # Import the script
-        module_name = os.path.basename(script_path).replace('.py', '')
-        spec = importlib.util.spec_from_file_location(module_name, script_path)
-        module = importlib.util.module_from_spec(spec)
-        
-        # Set sys.argv for the script
-        original_argv = sys.argv.copy()
-        sys.argv = [script_path, target_path]
-        
-        # Execute the script
+            f.write(_LAUNCHER_SRC)
+        with open(self.launcher_hash_path, 'w') as f:
+            f.write(_LAUNCHER_HASH)
+    
+    def _launcher_is_current(self):
+        """Check that the launcher exists and matches the bundled source."""
+        if not os.path.exists(self.launcher_path):
+            return False
         try:
-            spec.loader.exec_module(module)
-            # If the script has a main function, call it
-            if hasattr(module, 'main'):
-                module.main()
-        except Exception as e:
-            print(f"Error executing script: {e}")
-            input("Press Enter to continue...")
-        finally:
-            # Restore sys.argv
-            sys.argv = original_argv
-    else:
-        # For non-Python scripts, run as a subprocess
-        subprocess.run([sys.executable, script_path, target_path], check=True)
+            with open(self.launcher_hash_path, 'r') as f:
+                return f.read().strip() == _LAUNCHER_HASH
+        except OSError:
+            return False
 
-if __name__ == "__main__":
-    # Check command line arguments
-    if len(sys.argv) >= 3:
-        script_path = sys.argv[1]
-        target_path = sys.argv[2]
-        
-        # Run the script
-        run_script(script_path, target_path)
-    else:
-        print("Usage: launcher.py script_path target_path")
-        input("Press Enter to continue...")
-''')
+# Scripts at least this large (bytes) are loaded into the editor in the background
+ASYNC_READ_SIZE = 256 * 1024
+
+def _read_script_file(path):
+    """
+    Read a script for the editor.
+    
+    Scripts are read as UTF-8, falling back to the locale encoding for
+    scripts saved in a legacy code page.
+    
+    Returns:
+        tuple: (content, encoding it was read with)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read(), 'utf-8'
+    except UnicodeDecodeError:
+        encoding = locale.getpreferredencoding(False)
+        with open(path, 'r', encoding=encoding) as f:
+            return f.read(), encoding
 
 class AdvancedContextMenuGUI(tk.Tk):
     """GUI for managing context menu scripts with categories and subcategories"""
@@ -509,6 +1049,19 @@ class AdvancedContextMenuGUI(tk.Tk):
         # Set up UI
         self._setup_ui()
         
+        # Dropdown values, valid for one configuration version
+        self._category_options_cache = {}
+        self._category_options_version = None
+        self._category_intervals = None
+        
+        # Script editor content keyed by script ID: (mtime, content, encoding)
+        self._script_content_cache = {}
+        # ID of the script whose content is still being read in the background
+        self._script_content_pending = None
+        # Encoding the editor content was read with, None while the editor
+        # doesn't hold the script's real content (loading or failed)
+        self._script_content_encoding = None
+        
         # Load data
         self._load_data()
     
@@ -669,24 +1222,172 @@ class AdvancedContextMenuGUI(tk.Tk):
     
     def _load_data(self):
         """Load categories and scripts from configuration"""
+        config = self.script_manager.config
+        
+        # Hide columns while repopulating so Tk doesn't redraw per insert
+        self.tree.configure(displaycolumns=())
+        
         # Clear tree
-        for item in self.tree.get_children("root"):
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children("root"))
         
         # Dictionary to map category IDs to tree IDs
         self.category_map = {"": "root"}
         
-        # Add categories
-        for category in self.script_manager.config['categories']:
-            parent_id = self.category_map.get(category['parent'], "root")
-            tree_id = self.tree.insert(parent_id, "end", text=category['name'], values=("Category",))
+        # Bucket categories by parent; unknown parents go under the root
+        category_ids = {c['id'] for c in config['categories']}
+        children = defaultdict(list)
+        for category in config['categories']:
+            parent = category['parent'] if category['parent'] in category_ids else ""
+            children[parent].append(category)
+        
+        # Add categories depth-first so parents always exist before children
+        stack = [("root", category) for category in reversed(children[""])]
+        while stack:
+            parent_id, category = stack.pop()
+            tree_id = self.tree.insert(parent_id, "end", iid=category['id'], text=category['name'], values=("Category",))
             self.category_map[category['id']] = tree_id
+            stack.extend((tree_id, child) for child in reversed(children[category['id']]))
         
-        # Add scripts
-        for script in self.script_manager.config['scripts']:
+        # Add scripts, grouped by category
+        scripts_by_cat = defaultdict(list)
+        for script in config['scripts']:
+            scripts_by_cat[script['category']].append(script)
+        
+        for category_id, scripts in scripts_by_cat.items():
+            parent_id = self.category_map.get(category_id, "root")
+            for script in scripts:
+                self._tree_insert_script(script, parent_id)
+        
+        # Reverse lookup from tree IDs back to category IDs
+        self._tree_to_cat = {tree_id: cat_id for cat_id, tree_id in self.category_map.items()}
+        
+        # Child categories of each category, for descendant checks
+        self._category_children = children
+        self._category_intervals = None
+        
+        self.tree.configure(displaycolumns="#all")
+        self.tree.update_idletasks()
+    
+    def _tree_insert_category(self, category):
+        """Add a new category to the tree without reloading it"""
+        parent = category['parent'] if category['parent'] in self.category_map else ""
+        siblings = self._category_children[parent]
+        
+        # Categories are listed before the scripts of their parent
+        tree_id = self.tree.insert(self.category_map[parent], len(siblings), iid=category['id'], text=category['name'], values=("Category",))
+        siblings.append(category)
+        self.category_map[category['id']] = tree_id
+        self._tree_to_cat[tree_id] = category['id']
+    
+    def _tree_insert_script(self, script, parent_id=None):
+        """Add a script to the tree, under its category unless parent_id is given"""
+        if parent_id is None:
             parent_id = self.category_map.get(script['category'], "root")
-            script_contexts = ", ".join(script['contexts'])
-            self.tree.insert(parent_id, "end", text=script['name'], values=(f"Script ({script_contexts})",), tags=(script['id'],))
+        script_contexts = ", ".join(script['contexts'])
+        self.tree.insert(parent_id, "end", iid=script['id'], text=script['name'], values=(f"Script ({script_contexts})",), tags=(script['id'],))
+    
+    def _tree_delete(self, item_id):
+        """Remove an item and everything below it from the tree without reloading it"""
+        category_id = self._tree_to_cat.get(item_id)
+        if category_id:
+            # Forget the category and its subcategories
+            parent = self._tree_to_cat.get(self.tree.parent(item_id), "")
+            self._category_children[parent] = [c for c in self._category_children[parent] if c['id'] != category_id]
+            for removed_id in self._category_descendants(category_id):
+                self._tree_to_cat.pop(self.category_map.pop(removed_id, None), None)
+                self._category_children.pop(removed_id, None)
+        
+        self.tree.delete(item_id)
+    
+    def _category_options(self, root_label="Root", exclude_id=None):
+        """
+        Get the values for a category dropdown.
+        
+        Results are cached until the configuration changes.
+        
+        Args:
+            root_label (str): Label of the leading entry that maps to no category
+            exclude_id (str, optional): Category to leave out together with its descendants
+            
+        Returns:
+            tuple: (tuple of names, dict mapping name to category ID)
+        """
+        if self._category_options_version != self.script_manager.version:
+            self._category_options_cache = {}
+            self._category_intervals = None
+            self._category_options_version = self.script_manager.version
+        
+        key = (root_label, exclude_id)
+        options = self._category_options_cache.get(key)
+        if options is None:
+            names = [root_label]
+            name_map = {root_label: ""}
+            
+            # Leave out the excluded category and everything numbered inside its interval
+            entry, exit_ = self._category_intervals_index()
+            low = entry.get(exclude_id)
+            high = exit_.get(exclude_id)
+            for cat in self.script_manager.config['categories']:
+                if low is None or not low <= entry.get(cat['id'], -1) <= high:
+                    names.append(cat['name'])
+                    name_map[cat['name']] = cat['id']
+            options = self._category_options_cache[key] = (tuple(names), name_map)
+        return options
+    
+    def _category_intervals_index(self):
+        """
+        Number the category tree depth-first.
+        
+        A category is below another exactly when its entry number lies
+        between the other's entry and exit numbers, so descendant checks
+        need no walk up the parent chain. Rebuilt once per config version.
+        
+        Returns:
+            tuple: (dict of entry numbers, dict of exit numbers) by category ID
+        """
+        if self._category_intervals is None:
+            entry = {}
+            exit_ = {}
+            counter = 0
+            stack = [(child['id'], False) for child in reversed(self._category_children.get("", ()))]
+            while stack:
+                category_id, done = stack.pop()
+                if done:
+                    exit_[category_id] = counter
+                elif category_id not in entry:
+                    entry[category_id] = counter
+                    stack.append((category_id, True))
+                    stack.extend((child['id'], False) for child in reversed(self._category_children.get(category_id, ())))
+                counter += 1
+            self._category_intervals = (entry, exit_)
+        return self._category_intervals
+    
+    def _category_descendants(self, category_id):
+        """
+        Get a category and all categories below it.
+        
+        Args:
+            category_id (str): Category ID
+            
+        Returns:
+            set: IDs of the category and its descendants
+        """
+        descendants = set()
+        stack = [category_id]
+        while stack:
+            current = stack.pop()
+            if current in descendants:
+                continue
+            descendants.add(current)
+            stack.extend(child['id'] for child in self._category_children.get(current, ()))
+        return descendants
+    
+    @staticmethod
+    def _set_combo_values(combo, values):
+        """Assign combobox values, skipping the Tk call if they are unchanged."""
+        if getattr(combo, 'shown_values', None) != values:
+            combo['values'] = values
+            combo.shown_values = values
     
     def _show_tree_menu(self, event):
         """Show context menu for tree view"""
@@ -723,17 +1424,11 @@ class AdvancedContextMenuGUI(tk.Tk):
     
     def _show_category_details(self, item_id):
         """Show details for selected category"""
-        # Get category name
-        category_name = self.tree.item(item_id, "text")
+        categories_by_id = self.script_manager.categories_by_id
         
         # Find category in configuration
-        category = None
-        category_id = ""
-        for cat in self.script_manager.config['categories']:
-            if cat['name'] == category_name and self.category_map.get(cat['id']) == item_id:
-                category = cat
-                category_id = cat['id']
-                break
+        category_id = self._tree_to_cat.get(item_id, "")
+        category = categories_by_id.get(category_id)
         
         if not category and item_id == "root":
             # Root category
@@ -746,34 +1441,14 @@ class AdvancedContextMenuGUI(tk.Tk):
             # Update fields
             self.category_name_var.set(category['name'])
             
-            # Update parent category dropdown
-            self.category_parent_combo['values'] = ["None"]
-            self.category_parent_map = {"None": ""}
-            
-            for cat in self.script_manager.config['categories']:
-                # Skip itself and its children (to avoid circular references)
-                if cat['id'] == category_id:
-                    continue
-                
-                # Check if this category is a child of the selected category
-                parent_id = cat['parent']
-                is_child = False
-                while parent_id:
-                    if parent_id == category_id:
-                        is_child = True
-                        break
-                    parent_cat = next((c for c in self.script_manager.config['categories'] if c['id'] == parent_id), None)
-                    if not parent_cat:
-                        break
-                    parent_id = parent_cat['parent']
-                
-                if not is_child:
-                    self.category_parent_combo['values'] = list(self.category_parent_combo['values']) + [cat['name']]
-                    self.category_parent_map[cat['name']] = cat['id']
+            # Update parent category dropdown, skipping itself and its
+            # children (to avoid circular references)
+            values, self.category_parent_map = self._category_options("None", category_id)
+            self._set_combo_values(self.category_parent_combo, values)
             
             # Set current parent
             if category['parent']:
-                parent_cat = next((c for c in self.script_manager.config['categories'] if c['id'] == category['parent']), None)
+                parent_cat = categories_by_id.get(category['parent'])
                 if parent_cat:
                     self.category_parent_var.set(parent_cat['name'])
                 else:
@@ -789,8 +1464,7 @@ class AdvancedContextMenuGUI(tk.Tk):
     
     def _show_script_details(self, item_id):
         """Show details for selected script"""
-        # Get script name and ID
-        script_name = self.tree.item(item_id, "text")
+        # Get script ID
         script_id = None
         
         # Find the script tag (which contains the ID)
@@ -799,7 +1473,7 @@ class AdvancedContextMenuGUI(tk.Tk):
             script_id = tags[0]
         
         # Find script in configuration
-        script = next((s for s in self.script_manager.config['scripts'] if s['id'] == script_id), None)
+        script = self.script_manager.scripts_by_id.get(script_id)
         
         if script:
             # Show script frame
@@ -809,16 +1483,12 @@ class AdvancedContextMenuGUI(tk.Tk):
             self.script_name_var.set(script['name'])
             
             # Update category dropdown
-            self.script_category_combo['values'] = ["Root"]
-            self.script_category_map = {"Root": ""}
-            
-            for cat in self.script_manager.config['categories']:
-                self.script_category_combo['values'] = list(self.script_category_combo['values']) + [cat['name']]
-                self.script_category_map[cat['name']] = cat['id']
+            values, self.script_category_map = self._category_options()
+            self._set_combo_values(self.script_category_combo, values)
             
             # Set current category
             if script['category']:
-                category = next((c for c in self.script_manager.config['categories'] if c['id'] == script['category']), None)
+                category = self.script_manager.categories_by_id.get(script['category'])
                 if category:
                     self.script_category_var.set(category['name'])
                 else:
@@ -837,23 +1507,75 @@ class AdvancedContextMenuGUI(tk.Tk):
             else:
                 self.script_icon_var.set("")
             
-            # Load script content
-            script_path = os.path.join(self.script_manager.scripts_dir, script['filename'])
-            try:
-                with open(script_path, 'r') as f:
-                    content = f.read()
-                self.script_content.delete('1.0', tk.END)
-                self.script_content.insert('1.0', content)
-            except Exception as e:
-                self.script_content.delete('1.0', tk.END)
-                self.script_content.insert('1.0', f"Error loading script: {e}")
-            
             # Store script ID for save function
             self.script_frame.script_id = script_id
+            
+            # Load script content
+            script_path = os.path.join(self.script_manager.scripts_dir, script['filename'])
+            self._load_script_content(script_id, script_path)
         else:
             # Script not found
             self.no_selection_label.pack(pady=50)
     
+    def _set_script_content(self, content):
+        """Replace the text in the script editor"""
+        self.script_content.delete('1.0', tk.END)
+        self.script_content.insert('1.0', content)
+    
+    def _load_script_content(self, script_id, script_path):
+        """
+        Show a script's content in the editor.
+        
+        Content is cached by modification time, and large files are read on a
+        background thread so selecting them doesn't block the UI.
+        """
+        self._script_content_pending = None
+        self._script_content_encoding = None
+        try:
+            st = os.stat(script_path)
+        except OSError as e:
+            self._set_script_content(f"Error loading script: {e}")
+            return
+        
+        cached = self._script_content_cache.get(script_id)
+        if cached and cached[0] == st.st_mtime:
+            self._script_content_encoding = cached[2]
+            self._set_script_content(cached[1])
+            return
+        
+        if st.st_size < ASYNC_READ_SIZE:
+            try:
+                content, encoding = _read_script_file(script_path)
+            except Exception as e:
+                self._set_script_content(f"Error loading script: {e}")
+                return
+            self._script_content_cache[script_id] = (st.st_mtime, content, encoding)
+            self._script_content_encoding = encoding
+            self._set_script_content(content)
+            return
+        
+        self._script_content_pending = script_id
+        self._set_script_content("Loading...")
+        threading.Thread(
+            target=self._read_script_content, args=(script_id, script_path, st.st_mtime), daemon=True
+        ).start()
+    
+    def _read_script_content(self, script_id, script_path, mtime):
+        """Read a script on a background thread and hand it back to the UI thread"""
+        try:
+            content, encoding = _read_script_file(script_path)
+            self._script_content_cache[script_id] = (mtime, content, encoding)
+        except Exception as e:
+            content, encoding = f"Error loading script: {e}", None
+        self.after(0, self._finish_script_content, script_id, content, encoding)
+    
+    def _finish_script_content(self, script_id, content, encoding):
+        """Show content read in the background if its script is still selected"""
+        if self._script_content_pending == script_id:
+            self._script_content_pending = None
+            self._script_content_encoding = encoding
+            self._set_script_content(content)
+    
     def _browse_icon(self):
         """Browse for an icon file"""
         icon_path = filedialog.askopenfilename(
@@ -883,12 +1605,7 @@ class AdvancedContextMenuGUI(tk.Tk):
         parent_combo.grid(row=1, column=1, padx=10, pady=10)
         
         # Populate parent dropdown
-        parent_combo['values'] = ["Root"]
-        parent_map = {"Root": ""}
-        
-        for cat in self.script_manager.config['categories']:
-            parent_combo['values'] = list(parent_combo['values']) + [cat['name']]
-            parent_map[cat['name']] = cat['id']
+        parent_combo['values'], parent_map = self._category_options()
         
         # Add button
         ttk.Button(dialog, text="Add Category", command=lambda: self._add_category_action(
@@ -904,8 +1621,8 @@ class AdvancedContextMenuGUI(tk.Tk):
         # Add category
         category_id = self.script_manager.add_category(name, parent)
         
-        # Refresh tree
-        self._load_data()
+        # Add it to the tree
+        self._tree_insert_category(self.script_manager.categories_by_id[category_id])
         
         # Close dialog
         dialog.destroy()
@@ -943,12 +1660,7 @@ class AdvancedContextMenuGUI(tk.Tk):
         category_combo.grid(row=2, column=1, sticky=tk.W, padx=10, pady=5)
         
         # Populate category dropdown
-        category_combo['values'] = ["Root"]
-        category_map = {"Root": ""}
-        
-        for cat in self.script_manager.config['categories']:
-            category_combo['values'] = list(category_combo['values']) + [cat['name']]
-            category_map[cat['name']] = cat['id']
+        category_combo['values'], category_map = self._category_options()
         
         ttk.Label(dialog, text="Context:").grid(row=3, column=0, sticky=tk.W, padx=10, pady=5)
         context_frame = ttk.Frame(dialog)
@@ -1002,8 +1714,8 @@ class AdvancedContextMenuGUI(tk.Tk):
             icon_path if icon_path else None
         )
         
-        # Refresh tree
-        self._load_data()
+        # Add it to the tree
+        self._tree_insert_script(self.script_manager.scripts_by_id[script_id])
         
         # Close dialog
         dialog.destroy()
@@ -1055,18 +1767,14 @@ class AdvancedContextMenuGUI(tk.Tk):
             
             if confirm:
                 # Find category ID
-                category_id = None
-                for cat_id, tree_id in self.category_map.items():
-                    if tree_id == item_id:
-                        category_id = cat_id
-                        break
+                category_id = self._tree_to_cat.get(item_id)
                 
                 if category_id:
                     # Delete category
                     self.script_manager.remove_category(category_id)
                     
-                    # Refresh tree
-                    self._load_data()
+                    # Remove it and its contents from the tree
+                    self._tree_delete(item_id)
                     
                     # Update status
                     self.status_var.set(f"Deleted category: {item_name}")
@@ -1088,8 +1796,8 @@ class AdvancedContextMenuGUI(tk.Tk):
                     # Delete script
                     self.script_manager.remove_script(script_id)
                     
-                    # Refresh tree
-                    self._load_data()
+                    # Remove it from the tree
+                    self._tree_delete(item_id)
                     
                     # Update status
                     self.status_var.set(f"Deleted script: {item_name}")
@@ -1116,25 +1824,25 @@ class AdvancedContextMenuGUI(tk.Tk):
         parent_name = self.category_parent_var.get()
         parent_id = self.category_parent_map.get(parent_name, "")
         
-        # Find category in config
-        category = next((c for c in self.script_manager.config['categories'] if c['id'] == category_id), None)
-        if category:
-            # Update category
-            category['name'] = category_name
-            category['parent'] = parent_id
-            
-            # Save config
-            self.script_manager.save_config()
-            
-            # Update registry entries for all scripts in this category
-            for script in self.script_manager.config['scripts']:
-                if script['category'] == category_id:
-                    self.script_manager._remove_registry_entries(script)
-                    self.script_manager._create_registry_entries(script)
+        # Scripts in this category and its subcategories get a new menu path
+        affected = self._category_descendants(category_id)
+        scripts = [s for s in self.script_manager.config['scripts'] if s['category'] in affected]
+        
+        # Remove their registry entries while the old path is still known
+        self.script_manager._remove_registry_entries_bulk(scripts)
+        
+        # Update category
+        if self.script_manager.update_category(category_id, category_name, parent_id):
+            # Create registry entries under the new path
+            ok = self.script_manager._create_registry_entries_bulk(scripts)
             
             # Refresh tree
             self._load_data()
             
+            if not ok:
+                messagebox.showerror("Error", "Failed to update the registry entries of the category's scripts")
+                return
+            
             # Update status
             self.status_var.set(f"Updated category: {category_name}")
     
@@ -1144,6 +1852,10 @@ class AdvancedContextMenuGUI(tk.Tk):
         if not script_id:
             return
         
+        if self._script_content_pending == script_id:
+            messagebox.showerror("Error", "Script content is still loading")
+            return
+        
         script_name = self.script_name_var.get()
         if not script_name:
             messagebox.showerror("Error", "Script name cannot be empty")
@@ -1168,19 +1880,24 @@ class AdvancedContextMenuGUI(tk.Tk):
         icon_path = self.script_icon_var.get()
         
         # Find script in config
-        script = next((s for s in self.script_manager.config['scripts'] if s['id'] == script_id), None)
+        script = self.script_manager.scripts_by_id.get(script_id)
         if script:
             # Get script path
             script_path = os.path.join(self.script_manager.scripts_dir, script['filename'])
             
-            # Save script content
-            try:
-                content = self.script_content.get('1.0', tk.END)
-                with open(script_path, 'w') as f:
-                    f.write(content)
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save script content: {e}")
-                return
+            # Save script content, in the encoding it was read with. If it
+            # couldn't be read, the editor only shows the error, so leave the
+            # file alone.
+            encoding = self._script_content_encoding
+            if encoding is not None:
+                try:
+                    content = self.script_content.get('1.0', tk.END)
+                    with open(script_path, 'w', buffering=1 << 16, encoding=encoding, newline='') as f:
+                        f.write(content)
+                    self._script_content_cache.pop(script_id, None)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to save script content: {e}")
+                    return
             
             # Update script
             self.script_manager.update_script(
@@ -1214,9 +1931,9 @@ class AdvancedContextMenuGUI(tk.Tk):
                 "Do you want to update all registry entries with the new Python path?"
             ):
                 # Update all scripts
-                for script in self.script_manager.config['scripts']:
-                    self.script_manager._remove_registry_entries(script)
-                    self.script_manager._create_registry_entries(script)
+                if not self.script_manager._batch_registry_update(self.script_manager.config['scripts']):
+                    messagebox.showerror("Error", "Failed to update the registry entries")
+                    return
                 
                 self.status_var.set("Updated all registry entries with new Python path")
     
@@ -1234,8 +1951,8 @@ class AdvancedContextMenuGUI(tk.Tk):
         
         if export_path:
             try:
-                with open(export_path, 'w') as f:
-                    json.dump(self.script_manager.config, f, indent=4)
+                with open(export_path, 'wb') as f:
+                    f.write(_dumps(self.script_manager.config))
                 
                 self.status_var.set(f"Configuration exported to: {export_path}")
             except Exception as e:
@@ -1250,8 +1967,8 @@ class AdvancedContextMenuGUI(tk.Tk):
         
         if import_path:
             try:
-                with open(import_path, 'r') as f:
-                    config = json.load(f)
+                with open(import_path, 'rb') as f:
+                    config = _loads(f.read())
                 
                 # Validate config
                 if not all(key in config for key in ['categories', 'scripts', 'python_path']):
@@ -1263,21 +1980,16 @@ class AdvancedContextMenuGUI(tk.Tk):
                     "Confirm Import",
                     "Importing will replace your current configuration. Continue?"
                 ):
-                    # Remove all current registry entries
-                    for script in self.script_manager.config['scripts']:
-                        self.script_manager._remove_registry_entries(script)
-                    
-                    # Set new config
-                    self.script_manager.config = config
-                    self.script_manager.save_config()
-                    
-                    # Create new registry entries
-                    for script in self.script_manager.config['scripts']:
-                        self.script_manager._create_registry_entries(script)
+                    # Swap the registry entries and set new config
+                    ok = self.script_manager._replace_registry_entries(config)
                     
                     # Refresh tree
                     self._load_data()
                     
+                    if not ok:
+                        messagebox.showerror("Error", "Configuration imported, but its registry entries could not be written")
+                        return
+                    
                     self.status_var.set("Configuration imported successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to import configuration: {e}")
@@ -1295,10 +2007,14 @@ class AdvancedContextMenuGUI(tk.Tk):
         
         messagebox.showinfo("About", about_text)
 
+@functools.lru_cache(maxsize=None)
 def is_admin():
     """Check if the script is running with administrator privileges"""
+    if os.name != 'nt':
+        return os.geteuid() == 0
     try:
-        return subprocess.run(["net", "session"], stdout=subprocess.PIPE, stderr=subprocess.PIPE).returncode == 0
+        import ctypes
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
     except Exception:
         return False
 
@@ -1,5 +1,51 @@
 import os
-from PyPDF2 import PdfMerger
+import platform
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pypdf import PdfReader, PdfWriter
+
+# File extensions treated as PDF documents (compared lowercased)
+ALLOWED = frozenset({'.pdf'})
+
+# qpdf exit code for a successful run that printed warnings
+QPDF_EXIT_WARNING = 3
+
+# How many files ahead of the merge loop are read into the page cache, and
+# the chunk size used to read them
+PREREAD_AHEAD = 4
+PREREAD_CHUNK = 1 << 20
+
+def iter_pdfs(directory_path):
+    """
+    Yields the paths of all PDF files in a directory and its subdirectories.
+    
+    Uses os.scandir, whose entries already know whether they are
+    directories, so no extra stat call is needed per file. Like os.walk,
+    a directory's own files come before those of its subdirectories.
+    
+    Args:
+        directory_path (str): Path to the directory to search
+    """
+    try:
+        entries = os.scandir(directory_path)
+    except OSError:
+        # Unreadable directory, skip it like os.walk does
+        return
+    subdirectories = []
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            else:
+                # Lowercase only the extension, not the whole file name
+                name = entry.name
+                dot = name.rfind('.')
+                if dot != -1 and name[dot:].lower() in ALLOWED:
+                    yield entry.path
+    
+    for subdirectory in subdirectories:
+        yield from iter_pdfs(subdirectory)
 
 def merge_pdfs(directory_path, output_path="merged_output.pdf", print_output=False):
     """
@@ -20,67 +66,135 @@ def merge_pdfs(directory_path, output_path="merged_output.pdf", print_output=Fal
         return False
     
     # Find all PDF files
-    pdf_files = []
-    for root, dirs, files in os.walk(directory_path):
-        for file in files:
-            if file.lower().endswith('.pdf'):
-                pdf_path = os.path.join(root, file)
-                pdf_files.append(pdf_path)
+    pdf_files = list(iter_pdfs(directory_path))
     
     if not pdf_files:
         print("No PDF files found in the directory.")
         return False
     
-    # Sort PDF files (for consistent ordering)
-    pdf_files.sort()
+    # Sort PDF files (for consistent, case-insensitive ordering)
+    pdf_files.sort(key=str.casefold)
     
-    # Create a PdfMerger object
-    merger = PdfMerger()
+    # Prefer qpdf, which merges natively, and fall back to pypdf without it
+    if not (_merge_with_qpdf(pdf_files, output_path) or _merge_with_pypdf(pdf_files, output_path)):
+        return False
+    
+    print(f"\nSuccessfully merged {len(pdf_files)} PDFs into {output_path}")
     
-    # Loop through all PDF files and append them to the merger
-    for pdf in pdf_files:
+    # Print the merged file if requested
+    if print_output:
+        system = platform.system()
         try:
-            print(f"Adding: {pdf}")
-            merger.append(pdf)
-        except Exception as e:
-            print(f"Error adding {pdf}: {str(e)}")
+            print(f"Sending merged PDF to printer...")
+            
+            if system == "Windows":
+                # Windows
+                subprocess.run(['start', '', '/p', output_path], shell=True, check=True)
+            elif system == "Darwin":
+                # macOS
+                subprocess.run(['lpr', output_path], check=True)
+            elif system == "Linux":
+                # Linux
+                subprocess.run(['lpr', output_path], check=True)
+            else:
+                print(f"Unsupported system for printing: {system}")
+                return False
+                
+            print("Print job sent successfully!")
+            
+        except subprocess.SubprocessError as e:
+            print(f"Error printing merged PDF: {str(e)}")
+            return False
     
-    # Write the merged PDF to the output file
+    return True
+
+def _merge_with_qpdf(pdf_files, output_path):
+    """
+    Merges PDF files with the qpdf command line tool, if it is installed.
+    
+    Args:
+        pdf_files (list): Paths of the PDF files to merge, in order
+        output_path (str): Path for the output merged PDF file
+        
+    Returns:
+        bool: True if qpdf produced the merged file, False otherwise
+    """
+    qpdf = shutil.which('qpdf')
+    if not qpdf:
+        return False
+    
+    print(f"Merging {len(pdf_files)} PDFs with qpdf...")
     try:
-        merger.write(output_path)
-        merger.close()
-        print(f"\nSuccessfully merged {len(pdf_files)} PDFs into {output_path}")
+        result = subprocess.run([qpdf, '--empty', '--pages', *pdf_files, '--', output_path])
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"qpdf failed ({str(e)}), falling back to pypdf")
+        return False
+    
+    # Exit code 3 means the merge succeeded with warnings, e.g. about
+    # slightly malformed input files
+    if result.returncode not in (0, QPDF_EXIT_WARNING):
+        print(f"qpdf failed (exit code {result.returncode}), falling back to pypdf")
+        return False
+    return True
+
+def _preread_pdf(path):
+    """
+    Reads a PDF file once and discards the data, so it is in the OS page
+    cache by the time the merge loop parses it.
+    
+    Args:
+        path (str): Path to the PDF file
+    """
+    try:
+        with open(path, 'rb', buffering=0) as pdf_file:
+            while pdf_file.read(PREREAD_CHUNK):
+                pass
+    except OSError:
+        # Reported by the merge loop when it tries to open the file
+        pass
+
+def _merge_with_pypdf(pdf_files, output_path):
+    """
+    Merges PDF files with pypdf.
+    
+    Args:
+        pdf_files (list): Paths of the PDF files to merge, in order
+        output_path (str): Path for the output merged PDF file
         
-        # Print the merged file if requested
-        if print_output:
-            import subprocess
-            import platform
-            
-            system = platform.system()
-            try:
-                print(f"Sending merged PDF to printer...")
-                
-                if system == "Windows":
-                    # Windows
-                    subprocess.run(['start', '', '/p', output_path], shell=True, check=True)
-                elif system == "Darwin":
-                    # macOS
-                    subprocess.run(['lpr', output_path], check=True)
-                elif system == "Linux":
-                    # Linux
-                    subprocess.run(['lpr', output_path], check=True)
-                else:
-                    print(f"Unsupported system for printing: {system}")
-                    return False
-                    
-                print("Print job sent successfully!")
-                
-            except subprocess.SubprocessError as e:
-                print(f"Error printing merged PDF: {str(e)}")
-                return False
+    Returns:
+        bool: True if the merged file was written, False otherwise
+    """
+    # Create a PdfWriter for the merged document
+    writer = PdfWriter()
+    
+    # Read the next few input files in the background while the pages are
+    # being copied, so the merge loop below mostly parses from warm cache.
+    # Reading further ahead could evict files before the loop reaches them.
+    with ThreadPoolExecutor(max_workers=PREREAD_AHEAD) as executor:
+        for pdf in pdf_files[:PREREAD_AHEAD]:
+            executor.submit(_preread_pdf, pdf)
         
+        # Loop through all PDF files and copy their pages into the writer.
+        # Each source file is closed as soon as its pages are copied, so only
+        # one input is held open at a time.
+        for i, pdf in enumerate(pdf_files):
+            if i + PREREAD_AHEAD < len(pdf_files):
+                executor.submit(_preread_pdf, pdf_files[i + PREREAD_AHEAD])
+            try:
+                print(f"Adding: {pdf}")
+                with open(pdf, 'rb') as pdf_file:
+                    reader = PdfReader(pdf_file)
+                    for page in reader.pages:
+                        writer.add_page(page)
+            except Exception as e:
+                print(f"Error adding {pdf}: {str(e)}")
+    
+    # Write the merged PDF to the output file
+    try:
+        with open(output_path, 'wb') as output_file:
+            writer.write(output_file)
+        writer.close()
         return True
-            
     except Exception as e:
         print(f"Error writing merged PDF: {str(e)}")
         return False
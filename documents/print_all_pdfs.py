@@ -2,56 +2,102 @@ import os
 import subprocess
 import platform
 
-def print_pdfs(directory_path):
+# File extensions treated as PDF documents (compared lowercased)
+ALLOWED = frozenset({'.pdf'})
+
+def _print_pdf(pdf_path, system):
+    """
+    Sends a single PDF file to the default system printer.
+    
+    Args:
+        pdf_path (str): Path to the PDF file
+        system (str): Name of the operating system (from platform.system())
+    """
+    try:
+        print(f"Printing: {pdf_path}")
+        if system == "Windows":
+            # Windows - use the default application to print
+            # Use ShellExecute in Windows to print
+            os.startfile(pdf_path, "print")
+        else:
+            # macOS and Linux
+            subprocess.run(['lpr', pdf_path], check=True)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Error printing {pdf_path}: {str(e)}")
+
+def iter_pdfs(directory_path):
     """
-    Prints all PDF files in the specified directory using the default system printer.
+    Yields the paths of all PDF files in a directory and its subdirectories.
+    
+    Uses os.scandir, whose entries already know whether they are
+    directories, so no extra stat call is needed per file. Like os.walk,
+    a directory's own files come before those of its subdirectories.
     
     Args:
-        directory_path (str): Path to the directory containing PDFs to print
+        directory_path (str): Path to the directory to search
+    """
+    try:
+        entries = os.scandir(directory_path)
+    except OSError:
+        # Unreadable directory, skip it like os.walk does
+        return
+    subdirectories = []
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            else:
+                # Lowercase only the extension, not the whole file name
+                name = entry.name
+                dot = name.rfind('.')
+                if dot != -1 and name[dot:].lower() in ALLOWED:
+                    yield entry.path
+    
+    for subdirectory in subdirectories:
+        yield from iter_pdfs(subdirectory)
+
+def find_pdfs(directory_path):
+    """
+    Finds all PDF files in the specified directory and its subdirectories.
+    
+    Args:
+        directory_path (str): Path to the directory to search
         
     Returns:
-        list: List of PDF files that were sent to the printer
+        list: Paths of the PDF files found
     """
-    pdf_files = []
+    return list(iter_pdfs(directory_path))
+
+def print_pdfs(pdf_source):
+    """
+    Prints PDF files using the default system printer, one after another
+    so the jobs reach the spooler in order.
     
-    # Check if the directory exists
-    if not os.path.isdir(directory_path):
-        print(f"Error: Directory '{directory_path}' does not exist.")
-        return pdf_files
+    Args:
+        pdf_source (str or list): Directory containing PDFs to print, or a
+            list of PDF paths already returned by find_pdfs()
+        
+    Returns:
+        list: List of PDF files that were sent to the printer
+    """
+    if isinstance(pdf_source, str):
+        # Check if the directory exists
+        if not os.path.isdir(pdf_source):
+            print(f"Error: Directory '{pdf_source}' does not exist.")
+            return []
+        pdf_files = find_pdfs(pdf_source)
+    else:
+        pdf_files = list(pdf_source)
     
     # Determine the operating system to use the correct print command
     system = platform.system()
+    if system not in ("Windows", "Darwin", "Linux"):
+        print(f"Unsupported system: {system}")
+        return []
     
-    # Walk through the directory
-    for root, dirs, files in os.walk(directory_path):
-        for file in files:
-            # Check if the file has a .pdf extension (case insensitive)
-            if file.lower().endswith('.pdf'):
-                # Get the full path to the PDF file
-                pdf_path = os.path.join(root, file)
-                pdf_files.append(pdf_path)
-                
-                # Print the PDF file based on operating system
-                try:
-                    if system == "Windows":
-                        # Windows - use the default application to print
-                        print(f"Printing: {pdf_path}")
-                        # Use ShellExecute in Windows to print
-                        os.startfile(pdf_path, "print")
-                    elif system == "Darwin":
-                        # macOS
-                        print(f"Printing: {pdf_path}")
-                        subprocess.run(['lpr', pdf_path], check=True)
-                    elif system == "Linux":
-                        # Linux
-                        print(f"Printing: {pdf_path}")
-                        subprocess.run(['lpr', pdf_path], check=True)
-                    else:
-                        print(f"Unsupported system: {system}")
-                        return pdf_files
-                    
-                except subprocess.SubprocessError as e:
-                    print(f"Error printing {pdf_path}: {str(e)}")
+    # Send the files to the printer in the order they were found
+    for pdf_path in pdf_files:
+        _print_pdf(pdf_path, system)
     
     print(f"\nTotal PDFs sent to printer: {len(pdf_files)}")
     return pdf_files
@@ -64,14 +110,13 @@ if __name__ == "__main__":
         print(f"Using current directory: {directory}")
     
     # Confirm before printing potentially many files
-    pdf_count = sum(1 for root, dirs, files in os.walk(directory) 
-               for file in files if file.lower().endswith('.pdf'))
+    pdf_files = find_pdfs(directory)
     
-    if pdf_count > 0:
-        confirm = input(f"Found {pdf_count} PDF files. Print them all? (y/n): ")
+    if pdf_files:
+        confirm = input(f"Found {len(pdf_files)} PDF files. Print them all? (y/n): ")
         if confirm.lower() == 'y':
-            # Print all PDFs in the directory
-            print_pdfs(directory)
+            # Print the PDFs found above without walking the directory again
+            print_pdfs(pdf_files)
         else:
             print("Printing cancelled.")
     else:
@@ -1,40 +1,398 @@
 import os
 import re
+import time
+import hashlib
+import shutil
+import socket
 import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import pypdfium2 as pdfium
 from docx2pdf import convert
-from PyPDF2 import PdfReader, PdfWriter
+from pypdf import PdfReader, PdfWriter
 
-def extract_email(pdf_reader, start_page, end_page):
+# pikepdf (libqpdf) splits at native speed; pypdf is used without it
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+# Hyperscan (SIMD DFA) locates emails faster than re; re is used without it
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Email address pattern, handling special characters in the local part.
+# A match may only start at the beginning of a run of address characters and
+# domain labels can't contain dots, so the search never rescans the same text
+# and stays linear even on long runs without an address.
+_EMAIL_RE = re.compile(r'(?<![A-Za-z0-9._%+\-])[A-Za-z0-9._%+\-]+@(?:[A-Za-z0-9\-_]+\.)+[A-Za-z]{2,}', re.ASCII)
+
+# Hyperscan database for the same pattern, reporting where each match starts
+if hyperscan is not None:
+    _EMAIL_DB = hyperscan.Database()
+    _EMAIL_DB.compile(
+        expressions=[rb'[A-Za-z0-9._%+\-]+@(?:[A-Za-z0-9\-_]+\.)+[A-Za-z]{2,}'],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST]
+    )
+
+# Characters that are not allowed in filenames
+_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]')
+
+# Buffer size for writing split parts, so pypdf's many small writes
+# become few system calls
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Converted PDFs of earlier runs, keyed by the SHA-256 of the document and
+# the converter used
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "split_docx")
+
+# Total size of converted PDFs kept in the cache; the least recently used
+# ones are removed beyond it
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Port of the persistent LibreOffice listener used with --listener
+LISTENER_PORT = 2002
+
+def _listener_running(port=LISTENER_PORT):
+    """
+    Check whether something accepts connections on the listener port.
+    
+    Args:
+        port (int): Port of the LibreOffice listener
+    
+    Returns:
+        bool: True if the port accepts connections
+    """
+    try:
+        with socket.create_connection(("localhost", port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+def start_listener(port=LISTENER_PORT, timeout=30):
     """
-    Extract email address from a range of pages in a PDF file using PyPDF2.
+    Start a headless LibreOffice that keeps running and accepts conversion
+    requests, unless one is already listening.
+    
+    The instance is left running after the script exits, so later
+    conversions don't pay the office startup time again.
     
     Args:
-        pdf_reader (PdfReader): PyPDF2 reader object
+        port (int): Port for the LibreOffice listener
+        timeout (int): Seconds to wait for the listener to come up
+    """
+    # The conversions themselves go through unoconv, so check for it before
+    # starting an office instance that nothing could talk to
+    if not shutil.which("unoconv"):
+        raise RuntimeError("unoconv was not found on PATH")
+    
+    if _listener_running(port):
+        return
+    
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if not soffice:
+        raise RuntimeError("LibreOffice (soffice) was not found on PATH")
+    
+    subprocess.Popen(
+        [soffice, "--headless", "--invisible", "--norestore",
+         f"--accept=socket,host=localhost,port={port};urp;"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    
+    # Wait until the listener accepts connections
+    deadline = time.monotonic() + timeout
+    while not _listener_running(port):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"LibreOffice listener did not start on port {port}")
+        time.sleep(0.2)
+
+def convert_with_listener(input_doc, output_pdf, port=LISTENER_PORT):
+    """
+    Convert a document to PDF through a running LibreOffice listener.
+    
+    Args:
+        input_doc (str): Path to the Word document
+        output_pdf (str): Path of the PDF file to write
+        port (int): Port of the LibreOffice listener
+    """
+    subprocess.run(
+        ["unoconv", "-c", f"socket,host=localhost,port={port};urp;StarOffice.ComponentContext",
+         "-f", "pdf", "-o", output_pdf, input_doc],
+        check=True
+    )
+
+def find_email(text):
+    """
+    Find the first email address in a text.
+    
+    Args:
+        text (str): Text to search
+    
+    Returns:
+        str: Found email address or None
+    """
+    if hyperscan is None:
+        match = _EMAIL_RE.search(text)
+        return match.group(0) if match else None
+    
+    starts = []
+    
+    def on_match(pattern_id, start, end, flags, context):
+        starts.append(start)
+        # Stop scanning at the first match
+        return True
+    
+    # Replacing non-ASCII characters one for one keeps the offsets in the
+    # bytes equal to the offsets in the text
+    try:
+        _EMAIL_DB.scan(text.encode('ascii', 'replace'), match_event_handler=on_match)
+    except hyperscan.ScanTerminated:
+        pass
+    
+    if not starts:
+        return None
+    
+    # Hyperscan reports the shortest match, let re extend it to the full address
+    match = _EMAIL_RE.match(text, starts[0])
+    return match.group(0) if match else None
+
+def get_page_text(pdf_doc, page_num, text_cache=None):
+    """
+    Extract the text of a single PDF page using pypdfium2.
+    
+    Args:
+        pdf_doc (pdfium.PdfDocument): pypdfium2 document object
+        page_num (int): Page to extract (0-based)
+        text_cache (list, optional): Text per page, None where not extracted yet
+    
+    Returns:
+        str: Text of the page
+    """
+    if text_cache is not None and text_cache[page_num] is not None:
+        return text_cache[page_num]
+    
+    page = pdf_doc[page_num]
+    textpage = page.get_textpage()
+    try:
+        text = textpage.get_text_range()
+    finally:
+        # Free the PDFium handles right away
+        textpage.close()
+        page.close()
+    
+    if text_cache is not None:
+        text_cache[page_num] = text
+    return text
+
+def extract_email(pdf_doc, start_page, end_page, text_cache=None):
+    """
+    Extract email address from a range of pages in a PDF file using pypdfium2.
+    
+    Args:
+        pdf_doc (pdfium.PdfDocument): pypdfium2 document object
         start_page (int): First page to analyze (0-based)
         end_page (int): Last page to analyze (0-based)
+        text_cache (list, optional): Text per page, shared between calls
     
     Returns:
         str: Found email address or None
     """
+    # Search page by page and stop at the first page with an email, so
+    # the remaining pages don't need to be extracted
+    for page_num in range(start_page, min(end_page + 1, len(pdf_doc))):
+        try:
+            text = get_page_text(pdf_doc, page_num, text_cache)
+        except pdfium.PdfiumError as e:
+            # Skip pages PDFium can't read, the email may be on another one
+            print(f"Error extracting text from page {page_num + 1}: {e}")
+            continue
+        
+        email = find_email(text)
+        if email:
+            return email
+    return None
+
+# Reader for the full PDF, opened once in each worker process
+_worker_reader = None
+
+def _init_worker(temp_pdf):
+    """
+    Open the full PDF once per worker process.
+    
+    Args:
+        temp_pdf (str): Path to the full PDF
+    """
+    global _worker_reader
+    _worker_reader = PdfReader(temp_pdf)
+
+def _write_part(start_page, end_page, output_pdf):
+    """
+    Write a range of pages of the full PDF to a new PDF file.
+    
+    Args:
+        start_page (int): First page of the part (0-based)
+        end_page (int): Last page of the part (0-based)
+        output_pdf (str): Path of the PDF file to write
+    """
+    # A new writer per part: pypdf has no public way to reset one, and its
+    # object table and page tree must not carry over into the next file
+    writer = PdfWriter()
+    
+    # Add the pages in one call, so resources shared between them (fonts,
+    # images) are copied into the new PDF once instead of once per page
+    writer.append(_worker_reader, pages=(start_page, end_page + 1), import_outline=False)
+    
+    # Save the new PDF
+    with open(output_pdf, "wb", buffering=WRITE_BUFFER_SIZE) as output_file:
+        writer.write(output_file)
+
+def _write_parts_pikepdf(temp_pdf, parts):
+    """
+    Write all parts with pikepdf, which copies pages natively and keeps
+    their streams as they are instead of re-encoding them.
+    
+    Args:
+        temp_pdf (str): Path to the full PDF
+        parts (dict): Maps output PDF paths to (first page, last page), 0-based
+    """
+    with pikepdf.open(temp_pdf) as src:
+        for output_pdf, (start_page, end_page) in parts.items():
+            with pikepdf.Pdf.new() as dst:
+                dst.pages.extend(src.pages[start_page:end_page + 1])
+                # Pack objects into compressed object streams, so less is written
+                dst.save(output_pdf, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+
+def _file_digest(path):
+    """
+    Compute the SHA-256 of a file, reading it in chunks.
+    
+    Args:
+        path (str): Path to the file
+    
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _convert_cached(input_doc, digest, use_listener=False):
+    """
+    Convert a document to PDF, reusing an earlier conversion of the same
+    contents from the cache.
+    
+    Args:
+        input_doc (str): Path to the Word document
+        digest (str): SHA-256 of the document, as the cache key
+        use_listener (bool): Convert through a running LibreOffice listener instead of docx2pdf
+    
+    Returns:
+        str: Path to the converted PDF in the cache
+    """
+    # PDFs from different converters differ, so each gets its own entry
+    converter = "listener" if use_listener else "docx2pdf"
+    cached_pdf = os.path.join(CACHE_DIR, f"{digest}-{converter}.pdf")
     try:
-        # Extract text from the specified range of pages
-        text = ""
-        for page_num in range(start_page, end_page + 1):
-            if page_num < len(pdf_reader.pages):
-                text += pdf_reader.pages[page_num].extract_text()
+        # Mark the entry as recently used, so pruning keeps it
+        os.utime(cached_pdf)
+        return cached_pdf
+    except FileNotFoundError:
+        pass
+    
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    
+    # Convert into a temporary directory that is removed automatically, even
+    # if the conversion fails, and move the PDF into the cache when complete
+    with tempfile.TemporaryDirectory(dir=CACHE_DIR) as temp_dir:
+        temp_pdf = os.path.join(temp_dir, "temp_full.pdf")
         
-        # Search for email pattern - improved version handling special characters
-        email_pattern = r'[A-Za-z0-9._%+\-_]+@[A-Za-z0-9.\-_]+\.[A-Z|a-z]{2,}'
-        match = re.search(email_pattern, text)
+        # Convert DOC/DOCX to PDF
+        if use_listener:
+            convert_with_listener(input_doc, temp_pdf)
+        else:
+            convert(input_doc, temp_pdf)
         
-        if match:
-            return match.group(0)
-        return None
-    except Exception as e:
-        print(f"Error extracting email: {e}")
+        os.replace(temp_pdf, cached_pdf)
+    
+    _prune_cache(cached_pdf)
+    return cached_pdf
+
+def _prune_cache(keep):
+    """
+    Remove the least recently used converted PDFs once the cache grows
+    beyond CACHE_MAX_BYTES.
+    
+    Args:
+        keep (str): Path of the entry that was just added, never removed
+    """
+    entries = []
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".pdf") and entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            # In use by another run, try again next time
+            continue
+        total -= size
+
+def _write_manifest(manifest_path, output_pdfs):
+    """
+    Record the size and modification time of each written part.
+    
+    Args:
+        manifest_path (str): Path of the manifest file
+        output_pdfs (iterable): Paths of the written PDF files
+    """
+    lines = []
+    for output_pdf in output_pdfs:
+        st = os.stat(output_pdf)
+        lines.append(f"{st.st_size} {st.st_mtime_ns} {os.path.basename(output_pdf)}")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+def _read_manifest(manifest_path, output_folder):
+    """
+    Check that the parts listed in a manifest are still the files it recorded.
+    
+    Parts are named the same for different options (part_1.pdf, ...), so a
+    run with other options may have overwritten them since.
+    
+    Args:
+        manifest_path (str): Path of the manifest file
+        output_folder (str): Folder holding the parts
+    
+    Returns:
+        int: Number of parts if all of them are unchanged, otherwise None
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        for line in lines:
+            size, mtime_ns, name = line.split(" ", 2)
+            st = os.stat(os.path.join(output_folder, name))
+            if st.st_size != int(size) or st.st_mtime_ns != int(mtime_ns):
+                return None
+    except (OSError, ValueError):
         return None
+    return len(lines)
 
-def split_doc_to_pdfs(input_doc, output_folder, pages_per_file=2, extract_emails=False, filename_prefix="part"):
+def split_doc_to_pdfs(input_doc, output_folder, pages_per_file=2, extract_emails=False, filename_prefix="part", use_listener=False):
     """
     Converts a Word document to PDF and splits it into smaller PDFs.
     
@@ -44,69 +402,133 @@ def split_doc_to_pdfs(input_doc, output_folder, pages_per_file=2, extract_emails
         pages_per_file (int): Number of pages in each output file (default 2)
         extract_emails (bool): Whether to extract emails from pages for filenames
         filename_prefix (str): Custom prefix for output filenames (default "part")
+        use_listener (bool): Convert through a running LibreOffice listener instead of docx2pdf
     """
     # Make sure output folder exists
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+    os.makedirs(output_folder, exist_ok=True)
+    
+    # Every output path starts with the folder and prefix, join them once
+    output_prefix = os.path.join(output_folder, filename_prefix)
     
-    # Temporary PDF file
-    temp_pdf = os.path.join(output_folder, "temp_full.pdf")
+    # Skip documents that were already split the same way into this folder
+    digest = _file_digest(input_doc)
+    options = f"{digest}:{pages_per_file}:{extract_emails}:{filename_prefix}:{use_listener}"
+    manifest_path = os.path.join(output_folder, f".cache-{hashlib.sha256(options.encode()).hexdigest()}")
+    outputs = _read_manifest(manifest_path, output_folder)
+    if outputs is not None:
+        print(f"Document unchanged, keeping its {outputs} PDF files")
+        return
     
-    # Convert DOC/DOCX to PDF
-    convert(input_doc, temp_pdf)
+    # Convert DOC/DOCX to PDF, or reuse the PDF of an earlier run
+    full_pdf = _convert_cached(input_doc, digest, use_listener)
     
-    # Open the full PDF
-    reader = PdfReader(temp_pdf)
-    total_pages = len(reader.pages)
+    # Open the full PDF with PDFium, which reads the page count without
+    # building pypdf's object tree, and extracts the text for emails
+    pdf_doc = pdfium.PdfDocument(full_pdf)
+    total_pages = len(pdf_doc)
     
-    # Split into parts with specified number of pages
+    # Text of each page, extracted on first use
+    page_text_cache = [None] * total_pages if extract_emails else None
+    
+    # Work out the page range and filename of every part. Parts that end
+    # up with the same filename are written once, with the last part's
+    # pages, as if they had been written one after another.
+    parts = {}
     for i in range(0, total_pages, pages_per_file):
-        writer = PdfWriter()
         start_page = i
         end_page = min(i + pages_per_file - 1, total_pages - 1)
         
-        # Add pages to the new PDF
-        for page_num in range(start_page, end_page + 1):
-            writer.add_page(reader.pages[page_num])
-        
-        # Default filename
-        if extract_emails:
-            file_prefix = filename_prefix
+        # Name the part after its email if requested, otherwise number it
+        if not extract_emails:
+            output_pdf = f"{output_prefix}_{i//pages_per_file + 1}.pdf"
         else:
-            file_prefix = f"{filename_prefix}_{i//pages_per_file + 1}"
-        
-        # Extract email if requested
-        if extract_emails:
-            email = extract_email(reader, start_page, end_page)
+            email = extract_email(pdf_doc, start_page, end_page, page_text_cache)
             if email:
                 # Use sanitized email as part of filename
-                sanitized_email = re.sub(r'[\\/*?:"<>|]', "_", email)
-                file_prefix = f"{filename_prefix}_{sanitized_email}"
+                output_pdf = f"{output_prefix}_{_SANITIZE_RE.sub('_', email)}.pdf"
+            else:
+                output_pdf = f"{output_prefix}.pdf"
         
-        # Save the new PDF
-        output_pdf = os.path.join(output_folder, f"{file_prefix}.pdf")
-        with open(output_pdf, "wb") as output_file:
-            writer.write(output_file)
+        parts.pop(output_pdf, None)
+        parts[output_pdf] = (start_page, end_page)
+    
+    # Release the PDFium document, which keeps the file open
+    pdf_doc.close()
+    
+    # Write the parts natively with pikepdf, or in parallel with pypdf,
+    # each worker with its own reader
+    if parts and pikepdf is not None:
+        _write_parts_pikepdf(full_pdf, parts)
+    elif parts:
+        workers = min(os.cpu_count() or 1, len(parts))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(full_pdf,)) as executor:
+            futures = [executor.submit(_write_part, start_page, end_page, output_pdf)
+                       for output_pdf, (start_page, end_page) in parts.items()]
+            for future in futures:
+                future.result()
+    
+    # Remember what was written, for the next run on the same document
+    _write_manifest(manifest_path, parts)
     
-    # Remove temporary file
-    os.remove(temp_pdf)
     print(f"Document split into {(total_pages + pages_per_file - 1) // pages_per_file} PDF files")
 
+def _subfolder_names(input_files):
+    """
+    Name an output subfolder for each input document after its file name.
+    
+    Documents with the same name from different folders get a numeric
+    suffix, so their parts don't overwrite each other.
+    
+    Args:
+        input_files (list): Paths to the input documents
+    
+    Returns:
+        list: Subfolder name for each input, in order
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in input_files]
+    
+    # Suffixed names must not take the name of another input either
+    reserved = {os.path.normcase(stem) for stem in stems}
+    used = set()
+    names = []
+    for stem in stems:
+        name = stem
+        suffix = 2
+        while os.path.normcase(name) in used or (name != stem and os.path.normcase(name) in reserved):
+            name = f"{stem}_{suffix}"
+            suffix += 1
+        used.add(os.path.normcase(name))
+        names.append(name)
+    return names
+
 def main():
     # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Split Word document into multiple PDFs')
-    parser.add_argument('input_file', help='Path to the input Word document')
+    parser = argparse.ArgumentParser(description='Split Word documents into multiple PDFs')
+    parser.add_argument('input_files', nargs='+', metavar='input_file',
+                        help='Path to an input Word document; with several, each gets a subfolder named after it')
     parser.add_argument('output_folder', help='Folder where output PDFs will be saved')
     parser.add_argument('-p', '--pages', type=int, default=2, help='Number of pages per output file (default: 2)')
     parser.add_argument('-e', '--extract-emails', action='store_true', 
                         help='Extract email addresses from pages and use them in filenames')
     parser.add_argument('-n', '--name', type=str, default='part',
                         help='Custom prefix for output filenames (default: "part")')
+    parser.add_argument('-l', '--listener', action='store_true',
+                        help=f'Convert through a persistent LibreOffice listener on port {LISTENER_PORT}, '
+                             'starting it if needed (requires unoconv)')
     
     args = parser.parse_args()
     
-    # Run the conversion
-    split_doc_to_pdfs(args.input_file, args.output_folder, args.pages, args.extract_emails, args.name)
+    # Start the listener once; it stays up for all the documents
+    if args.listener:
+        start_listener()
+    
+    # Run the conversion for each document, keeping their parts apart
+    if len(args.input_files) > 1:
+        output_folders = [os.path.join(args.output_folder, name) for name in _subfolder_names(args.input_files)]
+    else:
+        output_folders = [args.output_folder]
+    for input_file, output_folder in zip(args.input_files, output_folders):
+        split_doc_to_pdfs(input_file, output_folder, args.pages, args.extract_emails, args.name, args.listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file